@@ -1,32 +1,97 @@
+import re
 from datetime import datetime
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.schemas.user import UserResponse
 from app.models.user import User
+from app.models.user_cache import cache_user, get_cached_user
 from app.database import get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme)
-) -> UserResponse:
+_UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I
+)
+
+def _as_uuid(value):
+    """Return ``value`` as a UUID, or None if it is not a canonical UUID string."""
+    if isinstance(value, UUID):
+        return value
+    if isinstance(value, str) and _UUID_RE.match(value):
+        return UUID(value)
+    return None
+
+def _load_user(db: Session, user_id: UUID):
     """
-    Dependency to get the current user from the JWT token without a database lookup.
-    This function supports two types of payloads:
-      - A full payload as a dict containing user info.
-      - A minimal payload, either as a dict with only a 'sub' key or directly as a UUID.
+    Return the user bound to ``db``, serving it from the snapshot cache when possible.
+    Cached snapshots are re-attached without a SELECT so route changes still flush.
     """
-    credentials_exception = HTTPException(
+    snapshot = get_cached_user(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        cache_user(user_id, snapshot)
+    return user
+
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised for any missing, invalid or unknown-user token."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+def _decoded_token(token: str = Depends(oauth2_scheme)):
+    """
+    Verify the bearer token once per request.
+    FastAPI caches sub-dependencies per request, so every dependant that
+    asks for this shares the same decoded payload.
+    """
     token_data = User.verify_token(token)
     if token_data is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return token_data
+
+# Placeholder fields for tokens that only identify the user by id.
+_MINIMAL_USER_TEMPLATE = {
+    "username": "unknown",
+    "email": "unknown@example.com",
+    "first_name": "Unknown",
+    "last_name": "User",
+    "is_active": True,
+    "is_verified": False,
+}
+_utcnow = datetime.utcnow
+
+def _minimal_user(user_id: UUID) -> UserResponse:
+    """Build the placeholder UserResponse for an id-only token, skipping validation."""
+    now = _utcnow()
+    return UserResponse.model_construct(
+        id=user_id,
+        created_at=now,
+        updated_at=now,
+        **_MINIMAL_USER_TEMPLATE,
+    )
+
+def get_current_user(
+    token_data = Depends(_decoded_token)
+) -> UserResponse:
+    """
+    Dependency to get the current user from the JWT token without a database lookup.
+    This function supports two types of payloads:
+      - A full payload as a dict containing user info.
+      - A minimal payload, either as a dict with only a 'sub' key or directly as a UUID.
+    """
+    credentials_exception = _credentials_exception()
 
     try:
         # If the token data is a dictionary:
@@ -36,80 +101,53 @@ def get_current_user(
                 return UserResponse(**token_data)
             # Otherwise, assume it is a minimal payload with only the 'sub' key.
             elif "sub" in token_data:
-                return UserResponse(
-                    id=token_data["sub"],
-                    username="unknown",
-                    email="unknown@example.com",
-                    first_name="Unknown",
-                    last_name="User",
-                    is_active=True,
-                    is_verified=False,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow(),
-                )
+                user_id = _as_uuid(token_data["sub"])
+                if user_id is None:
+                    raise credentials_exception
+                return _minimal_user(user_id)
             else:
                 raise credentials_exception
 
         # If the token data is directly a UUID (minimal payload):
         elif isinstance(token_data, UUID):
-            return UserResponse(
-                id=token_data,
-                username="unknown",
-                email="unknown@example.com",
-                first_name="Unknown",
-                last_name="User",
-                is_active=True,
-                is_verified=False,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-            )
+            return _minimal_user(token_data)
         else:
             raise credentials_exception
 
-    except Exception:
+    except (ValueError, TypeError, KeyError, ValidationError):
         raise credentials_exception
 
+def _verified_user_id(token_data = Depends(_decoded_token)) -> UUID:
+    """
+    Extract the user ID from a verified token, raising 401 if it has none.
+    Kept separate from the DB lookup so invalid tokens never open a session.
+    """
+    user_id = None
+    if isinstance(token_data, dict):
+        if "sub" in token_data:
+            user_id = _as_uuid(token_data["sub"])
+        elif "id" in token_data:
+            user_id = _as_uuid(token_data["id"])
+    elif isinstance(token_data, UUID):
+        user_id = token_data
+
+    if user_id is None:
+        raise _credentials_exception()
+    return user_id
+
 def get_current_user_from_db(
-    token: str = Depends(oauth2_scheme),
+    user_id: UUID = Depends(_verified_user_id),
     db: Session = Depends(get_db)
 ) -> User:
     """
     Dependency to get the current user from the database using JWT token.
     Returns the actual User model instance, not just a UserResponse.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    token_data = User.verify_token(token)
-    if token_data is None:
-        raise credentials_exception
-
-    try:
-        # Extract user ID from token
-        user_id = None
-        if isinstance(token_data, dict):
-            if "sub" in token_data:
-                user_id = UUID(token_data["sub"]) if isinstance(token_data["sub"], str) else token_data["sub"]
-            elif "id" in token_data:
-                user_id = UUID(token_data["id"]) if isinstance(token_data["id"], str) else token_data["id"]
-        elif isinstance(token_data, UUID):
-            user_id = token_data
-        
-        if user_id is None:
-            raise credentials_exception
-        
-        # Load user from database
-        user = db.query(User).filter(User.id == user_id).first()
-        if user is None:
-            raise credentials_exception
-        
-        return user
-
-    except Exception:
-        raise credentials_exception
+    # Load user from database (or the short-lived snapshot cache)
+    user = _load_user(db, user_id)
+    if user is None:
+        raise _credentials_exception()
+    return user
 
 def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user)
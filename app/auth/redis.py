@@ -1,39 +1,112 @@
 # app/auth/redis.py
 """Utility helpers for optional Redis-based token blacklisting."""
 
+import asyncio
+from typing import Iterable, Optional, Tuple
+
+from cachetools import TTLCache
+
 from app.core.config import get_settings
 
 try:
-    import aioredis  # type: ignore
+    import redis.asyncio as aioredis  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
     aioredis = None
 
 settings = get_settings()
 
+# Shared client, created once on first use and reused by every caller.
+_redis: Optional["aioredis.Redis"] = None
+_init_lock: Optional[asyncio.Lock] = None
+
+# In-process caches in front of Redis, keyed by JTI. Revoked tokens stay
+# revoked, so positive hits can live longer than negative ones.
+_negative_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_positive_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
 
 async def get_redis():
-    """Return a cached Redis client when aioredis is available."""
+    """Return the shared Redis client when redis-py is available."""
+    global _redis, _init_lock
+
     if aioredis is None:
         return None
+    if _redis is not None:
+        return _redis
 
-    if not hasattr(get_redis, "redis"):
-        get_redis.redis = await aioredis.from_url(  # type: ignore[attr-defined]
-            settings.REDIS_URL or "redis://localhost"
-        )
-    return getattr(get_redis, "redis", None)
+    if _init_lock is None:
+        _init_lock = asyncio.Lock()
+    async with _init_lock:
+        # Another coroutine may have created the client while we waited.
+        if _redis is None:
+            _redis = aioredis.from_url(settings.REDIS_URL or "redis://localhost")
+    return _redis
 
 
 async def add_to_blacklist(jti: str, exp: int) -> None:
     """Add a token's JTI to the blacklist when Redis support is available."""
+    # Make the revocation visible to this process immediately.
+    _negative_cache.pop(jti, None)
+    _positive_cache[jti] = True
+
     redis = await get_redis()
     if redis is None:
         return
     await redis.set(f"blacklist:{jti}", "1", ex=exp)
 
 
+async def add_many_to_blacklist(items: Iterable[Tuple[str, int]]) -> None:
+    """Blacklist several (jti, exp) pairs in a single pipelined round-trip."""
+    items = list(items)
+    for jti, _ in items:
+        _negative_cache.pop(jti, None)
+        _positive_cache[jti] = True
+
+    redis = await get_redis()
+    if redis is None or not items:
+        return
+    pipe = redis.pipeline(transaction=False)
+    for jti, exp in items:
+        pipe.set(f"blacklist:{jti}", "1", ex=exp)
+    await pipe.execute()
+
+
+async def remove_prefix(prefix: str, batch_size: int = 500) -> None:
+    """Delete every key starting with ``prefix`` using batched, non-blocking UNLINKs."""
+    # Un-revoked JTIs must not linger in the positive cache.
+    _positive_cache.clear()
+
+    redis = await get_redis()
+    if redis is None:
+        return
+    # Send each full batch as it fills, so neither side buffers the whole prefix
+    pipe = redis.pipeline(transaction=False)
+    chunk = []
+    async for key in redis.scan_iter(match=f"{prefix}*", count=1000):
+        chunk.append(key)
+        if len(chunk) >= batch_size:
+            pipe.unlink(*chunk)
+            await pipe.execute()
+            chunk = []
+    if chunk:
+        pipe.unlink(*chunk)
+        await pipe.execute()
+
+
 async def is_blacklisted(jti: str) -> bool:
     """Check whether a token is blacklisted, defaulting to False without Redis."""
+    if jti in _positive_cache:
+        return True
+    if jti in _negative_cache:
+        return False
+
     redis = await get_redis()
     if redis is None:
         return False
-    return await redis.exists(f"blacklist:{jti}")
\ No newline at end of file
+
+    blacklisted = bool(await redis.exists(f"blacklist:{jti}"))
+    if blacklisted:
+        _positive_cache[jti] = True
+    else:
+        _negative_cache[jti] = True
+    return blacklisted
@@ -32,6 +32,11 @@ def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
     """Factory function to create a new SQLAlchemy engine."""
     return _create_engine(database_url)
 
-def get_sessionmaker(engine):
-    """Factory function to create a new sessionmaker bound to the given engine."""
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_sessionmaker(engine, **kwargs):
+    """Factory function to create a new sessionmaker bound to the given engine.
+
+    Extra keyword arguments (e.g. ``expire_on_commit``) are passed through to
+    ``sessionmaker`` and override the defaults.
+    """
+    options = {"autocommit": False, "autoflush": False, **kwargs}
+    return sessionmaker(bind=engine, **options)
@@ -15,6 +15,7 @@ basic mathematical operations: addition, subtraction, multiplication, and divisi
 """
 
 from datetime import datetime
+import functools
 import uuid
 from typing import List
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
@@ -23,6 +24,26 @@ from sqlalchemy.orm import relationship, declared_attr
 from sqlalchemy.ext.declarative import declared_attr
 from app.database import Base
 
+def cached_on_inputs(get_result):
+    """
+    Memoize a get_result() implementation per instance.
+
+    The result is reused for as long as ``inputs`` is the same list object;
+    assigning new inputs (as the update route does) recomputes it. Inputs
+    must not be mutated in place. Errors are not cached.
+    """
+    @functools.wraps(get_result)
+    def wrapper(self):
+        inputs = self.inputs
+        cached = self.__dict__.get("_cached_result")
+        if cached is not None and cached[0] is inputs:
+            return cached[1]
+        result = get_result(self)
+        # Hold the inputs themselves, not id(): a freed list's id can be reused
+        self._cached_result = (inputs, result)
+        return result
+    return wrapper
+
 class AbstractCalculation:
     """
     Abstract base class for calculations.
@@ -241,6 +262,7 @@ class Addition(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "addition"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate the sum of all input values.
@@ -270,6 +292,7 @@ class Subtraction(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate the result of subtracting subsequent values from the first value.
@@ -302,6 +325,7 @@ class Multiplication(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate the product of all input values.
@@ -335,6 +359,7 @@ class Division(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "division"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate the result of dividing the first value by all subsequent values.
@@ -373,6 +398,7 @@ class Exponentiation(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "exponentiation"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate exponentiation result.
@@ -410,6 +436,7 @@ class Modulus(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "modulus"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate modulus result.
@@ -447,6 +474,7 @@ class Minimum(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "minimum"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Find the minimum value from inputs.
@@ -475,6 +503,7 @@ class Maximum(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "maximum"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Find the maximum value from inputs.
@@ -503,6 +532,7 @@ class Average(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "average"}
 
+    @cached_on_inputs
     def get_result(self) -> float:
         """
         Calculate the arithmetic mean of inputs.
@@ -17,15 +17,20 @@ The User model is designed to follow security best practices:
 
 import uuid
 from datetime import datetime, timezone, timedelta
+from jose import jwt, JWTError
 from sqlalchemy import Column, String, Boolean, DateTime, or_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 from app.core.config import get_settings
 from app.database import Base
 from app.models.calculation import Calculation
+from app.models.user_cache import invalidate_after_commit
 
 settings = get_settings()
 
+# Upper bound on the Base64URL payload segment accepted by verify_token
+MAX_TOKEN_PAYLOAD_LENGTH = 4096
+
 def utcnow():
     """
     Helper function to get current UTC datetime with timezone information.
@@ -129,6 +134,7 @@ class User(Base):
         for key, value in kwargs.items():
             setattr(self, key, value)
         self.updated_at = utcnow()
+        invalidate_after_commit(object_session(self), self.id)
         return self
 
     @property
@@ -282,9 +288,16 @@ class User(Base):
             UUID: User ID if token is valid, None otherwise
         """
         from app.core.config import settings
-        from jose import jwt, JWTError
+        # Reject malformed or oversized tokens before any Base64/JSON decoding
+        parts = token.split(".", 2) if isinstance(token, str) else []
+        if len(parts) != 3 or len(parts[1]) > MAX_TOKEN_PAYLOAD_LENGTH:
+            return None
         try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+            payload = jwt.decode(
+                token,
+                settings.JWT_SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+            )
             sub = payload.get("sub")
             if sub is None:
                 return None
@@ -309,6 +322,10 @@ class User(Base):
         Raises:
             ValueError: If username/email already exists for another user
         """
+        # Nothing to change: skip the uniqueness queries and the updated_at bump
+        if not profile_data:
+            return self
+        
         # Check if username is being updated and if it's already taken
         if "username" in profile_data and profile_data["username"] != self.username:
             existing = db.query(User).filter(
@@ -336,6 +353,7 @@ class User(Base):
             self.last_name = profile_data["last_name"]
         
         self.updated_at = utcnow()
+        invalidate_after_commit(db, self.id)
         return self
 
     def change_password(self, db, old_password: str, new_password: str):
@@ -353,19 +371,20 @@ class User(Base):
         Raises:
             ValueError: If old password is incorrect or new password is invalid
         """
-        # Verify old password
-        if not self.verify_password(old_password):
-            raise ValueError("Current password is incorrect")
-        
-        # Validate new password
+        # Validate new password first: these checks are free, bcrypt is not
         if not new_password or len(new_password) < 6:
             raise ValueError("New password must be at least 6 characters long")
         
         if new_password == old_password:
             raise ValueError("New password must be different from current password")
         
+        # Verify old password
+        if not self.verify_password(old_password):
+            raise ValueError("Current password is incorrect")
+        
         # Update password
         self.password = self.hash_password(new_password)
         self.password_updated_at = utcnow()
         self.updated_at = utcnow()
+        invalidate_after_commit(db, self.id)
         return self
\ No newline at end of file
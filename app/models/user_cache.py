@@ -0,0 +1,63 @@
+# app/models/user_cache.py
+"""
+Short-lived, process-wide cache of User column snapshots, keyed by user id.
+
+The auth dependencies read from it to skip the per-request user SELECT; the
+User update methods invalidate entries once their changes commit, so a
+request racing the commit can't re-cache the old row for a full TTL.
+The TTL is the longest a role/active-flag change made outside those methods
+can go unnoticed.
+"""
+
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_user_cache = TTLCache(maxsize=4096, ttl=10)
+_user_cache_lock = threading.Lock()
+
+# Session.info key holding the ids to invalidate when the session commits
+_PENDING_KEY = "user_cache_pending"
+
+def get_cached_user(user_id) -> Optional[dict]:
+    """Return the cached column snapshot for ``user_id``, if any."""
+    with _user_cache_lock:
+        return _user_cache.get(user_id)
+
+def cache_user(user_id, snapshot: dict) -> None:
+    """Store a column snapshot for ``user_id``."""
+    with _user_cache_lock:
+        _user_cache[user_id] = snapshot
+
+def invalidate_cached_user(user_id) -> None:
+    """Drop a user's cached snapshot so the next request reloads it."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+def invalidate_after_commit(session: Optional[Session], user_id) -> None:
+    """
+    Drop a user's cached snapshot once ``session`` commits its current
+    transaction, or straight away when there is no session.
+    """
+    if session is None:
+        invalidate_cached_user(user_id)
+        return
+    session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+def clear_user_cache() -> None:
+    """Drop every cached snapshot."""
+    with _user_cache_lock:
+        _user_cache.clear()
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_cached_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session: Session) -> None:
+    # Nothing changed, so whatever is cached is still current
+    session.info.pop(_PENDING_KEY, None)
@@ -1,4 +1,8 @@
+import hashlib
+import itertools
+import json
 import os
+import shutil
 import socket
 import subprocess
 import sys
@@ -7,15 +11,34 @@ import logging
 from pathlib import Path
 from typing import Generator, Dict, List
 from contextlib import contextmanager
+from urllib.parse import urlparse
+from uuid import uuid4
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
+
+# Unique emails/usernames come from a counter rather than per-call random
+# draws. The per-run prefix keeps rows distinct across xdist workers and
+# --preserve-db runs that share one database.
+_RUN_ID = uuid4().hex[:6]
+_unique_ids = itertools.count(1)
+
+def _unique_suffix() -> str:
+    return f"{_RUN_ID}_{next(_unique_ids)}"
+
+def unique_email() -> str:
+    """Return an email address no other call in this run will return."""
+    return f"user{_unique_suffix()}@example.com"
+
+def unique_username() -> str:
+    """Return a username no other call in this run will return."""
+    return f"user_{_unique_suffix()}"
 
 try:
     from faker import Faker  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover - fallback when Faker isn't installed
     import random
-    from uuid import uuid4
 
     class _FallbackUnique:
         def __init__(self, parent: "_FallbackFaker") -> None:
@@ -42,11 +65,10 @@ except ModuleNotFoundError:  # pragma: no cover - fallback when Faker isn't inst
             return f"Last{random.randint(1, 9999)}"
 
         def _unique_email(self) -> str:
-            suffix = uuid4().hex[:8]
-            return f"user{suffix}@example.com"
+            return unique_email()
 
         def _unique_username(self) -> str:
-            return f"user_{uuid4().hex[:10]}"
+            return unique_username()
 
         def password(self, length: int = 12) -> str:
             base = "P@ssw0rd"
@@ -58,13 +80,20 @@ except ModuleNotFoundError:  # pragma: no cover - fallback when Faker isn't inst
         return _FallbackFaker()
 
     Faker.seed = staticmethod(lambda _: None)  # type: ignore[attr-defined]
+
+# app.auth.jwt builds its CryptContext from settings.BCRYPT_ROUNDS at import,
+# so this must be set before any app module loads. It is inherited by the E2E
+# server subprocess too. Cost 4 is bcrypt's minimum, 256x cheaper than 12;
+# export BCRYPT_ROUNDS to test at another cost.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.database import Base, get_engine, get_sessionmaker
 from app.models.user import User
 from app.core.config import settings
-from app.database_init import init_db, drop_db
 
 # ======================================================================================
 # Logging Configuration
@@ -81,39 +110,40 @@ logger = logging.getLogger(__name__)
 fake = Faker()
 Faker.seed(12345)
 
-# Configure test engine with SQLite-specific options to handle concurrent access
+# Configure test engine. SQLite runs fully in memory: every session shares one
+# connection (StaticPool), so writes never touch the filesystem.
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import make_url
 from sqlalchemy.pool import StaticPool
 
 database_url = settings.DATABASE_URL
 url = make_url(database_url)
-engine_kwargs = {"echo": False}
 
 if url.get_backend_name() == "sqlite":
-    engine_kwargs.update(
-        connect_args={
-            "check_same_thread": False,
-            "timeout": 30,
-            "isolation_level": None  # Autocommit mode
-        },
-        poolclass=StaticPool  # Disable pooling for in-memory/SQLite tests
+    test_engine = create_engine(
+        "sqlite+pysqlite:///file:testdb?mode=memory&cache=shared&uri=true",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        echo=False,
     )
-else:
-    engine_kwargs["pool_pre_ping"] = True
 
-test_engine = create_engine(database_url, **engine_kwargs)
-
-if url.get_backend_name() == "sqlite":
-    # Enable WAL mode for better concurrency
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+    # emit BEGIN itself so db_session can nest savepoints.
     @event.listens_for(test_engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.execute("PRAGMA busy_timeout=30000")  # 30 second timeout
-        cursor.close()
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(test_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+else:
+    test_engine = create_engine(database_url, echo=False, pool_pre_ping=True)
 
-TestingSessionLocal = get_sessionmaker(engine=test_engine)
+# Tests don't rely on cross-session staleness, so skip re-fetching attributes
+# after every commit.
+TestingSessionLocal = get_sessionmaker(
+    engine=test_engine, autoflush=False, expire_on_commit=False
+)
 
 # ======================================================================================
 # Helper Functions
@@ -123,8 +153,8 @@ def create_fake_user() -> Dict[str, str]:
     return {
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
-        "email": fake.unique.email(),
-        "username": fake.unique.user_name(),
+        "email": unique_email(),
+        "username": unique_username(),
         "password": fake.password(length=12)
     }
 
@@ -146,17 +176,27 @@ def managed_db_session():
 # ======================================================================================
 def wait_for_server(url: str, timeout: int = 30) -> bool:
     """
-    Wait for the server to be ready by repeatedly issuing GET requests until
-    we receive a 200 status code or hit the timeout.
+    Wait for the server to be ready. A cheap TCP probe with exponential backoff
+    (25ms up to 400ms) waits for the port to open, then GET requests over one
+    shared session confirm a 200 status code before the timeout.
     """
-    start_time = time.time()
-    while (time.time() - start_time) < timeout:
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                return True
-        except requests.exceptions.ConnectionError:
-            time.sleep(1)
+    parsed = urlparse(url)
+    address = (parsed.hostname, parsed.port or 80)
+    deadline = time.monotonic() + timeout
+    delay = 0.025
+
+    with requests.Session() as session:
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(address, timeout=0.2):
+                    pass
+                response = session.get(url, timeout=1)
+                if response.status_code == 200:
+                    return True
+            except (OSError, requests.exceptions.RequestException):
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 0.4)
     return False
 
 class ServerStartupError(Exception):
@@ -174,11 +214,18 @@ def setup_test_database(request):
     NOTE: This fixture is NOT autouse - it must be explicitly requested by tests
     to avoid conflicts with the E2E server fixture.
     """
+    # Every xdist worker would create_all/drop_all on the same shared database
+    # and drop tables from under the others; in-memory SQLite is per process.
+    if os.environ.get("PYTEST_XDIST_WORKER") and url.get_backend_name() != "sqlite":
+        pytest.fail(
+            "Tests that use the test database can't run under pytest-xdist "
+            "against a shared DATABASE_URL; run them without -n"
+        )
+
     logger.info("Setting up test database...")
     try:
         # Only create tables if they don't exist (avoid dropping to prevent locks)
         Base.metadata.create_all(bind=test_engine, checkfirst=True)
-        init_db()
         logger.info("Test database initialized.")
     except Exception as e:
         logger.error(f"Error setting up test database: {str(e)}")
@@ -188,24 +235,34 @@ def setup_test_database(request):
 
     if not request.config.getoption("--preserve-db"):
         logger.info("Dropping test database tables...")
-        drop_db()
+        Base.metadata.drop_all(bind=test_engine)
 
-@pytest.fixture
-def db_session(setup_test_database) -> Generator[Session, None, None]:
+@pytest.fixture(scope="module")
+def connection(setup_test_database) -> Generator[Connection, None, None]:
     """
-    Provide a test-scoped database session. Commits after a successful test;
-    rolls back if an exception occurs.
+    Provide one database connection per test module. Each test runs in its own
+    transaction on it (see db_session), so checking out a pooled connection -
+    and the reset ROLLBACK on checkin - happens once per module, not per test.
     NOTE: Explicitly depends on setup_test_database to ensure DB is initialized.
     """
-    session = TestingSessionLocal()
+    with test_engine.connect() as conn:
+        yield conn
+
+@pytest.fixture
+def db_session(connection: Connection) -> Generator[Session, None, None]:
+    """
+    Provide a test-scoped database session wrapped in an outer transaction that
+    is rolled back after the test, so no test leaks rows into the next.
+    The session joins that transaction through a SAVEPOINT: commit() releases
+    the savepoint and rollback() only undoes work since the last commit.
+    """
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
     finally:
         session.close()
+        transaction.rollback()
 
 # ======================================================================================
 # Test Data Fixtures
@@ -215,23 +272,45 @@ def fake_user_data() -> Dict[str, str]:
     """Provide fake user data."""
     return create_fake_user()
 
-@pytest.fixture
-def test_user(db_session: Session) -> User:
+@pytest.fixture(scope="session")
+def _test_password_hash() -> str:
+    """Hash the shared test password once per session; bcrypt is deliberately slow."""
+    return User.hash_password("TestPass123")
+
+@pytest.fixture(scope="session")
+def _test_user_id(setup_test_database, _test_password_hash: str):
     """
-    Create and return a single test user in the database with hashed password.
-    The password is set to 'TestPass123' for consistent testing.
+    Insert the shared test user once per session and return its id.
+    The row is committed outside any test transaction, so every test's
+    db_session sees it, and setup_test_database drops it with the tables.
     """
     user_data = create_fake_user()
     # Use a consistent password for testing
     user_data.pop("password")  # Remove random password
-    from app.models.user import User as UserModel
-    hashed_password = UserModel.hash_password("TestPass123")
-    user = User(**user_data, password=hashed_password)
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    logger.info(f"Created test user ID: {user.id}")
-    return user
+    with managed_db_session() as session:
+        user = User(**user_data, password=_test_password_hash)
+        session.add(user)
+        session.commit()
+        logger.info(f"Created test user ID: {user.id}")
+        return user.id
+
+@pytest.fixture
+def test_user(db_session: Session, _test_user_id) -> User:
+    """
+    Return the shared test user loaded into this test's db_session.
+    The password is 'TestPass123'. Changes a test makes to the user roll
+    back with its db_session, like any other row.
+    """
+    return db_session.get(User, _test_user_id)
+
+@pytest.fixture(scope="session")
+def auth_headers(_test_user_id) -> Dict[str, str]:
+    """
+    Provide a bearer Authorization header for test_user.
+    The user is created once per session, so the token is signed only once.
+    """
+    token = User.create_access_token({"sub": str(_test_user_id)})
+    return {"Authorization": f"Bearer {token}"}
 
 @pytest.fixture
 def seed_users(db_session: Session, request) -> List[User]:
@@ -240,29 +319,152 @@ def seed_users(db_session: Session, request) -> List[User]:
     unless a 'param' value is provided (e.g., via @pytest.mark.parametrize).
     """
     num_users = getattr(request, "param", 5)
-    users = [User(**create_fake_user()) for _ in range(num_users)]
-    db_session.add_all(users)
+    rows = [create_fake_user() for _ in range(num_users)]
+    # Bulk insert skips per-object unit-of-work bookkeeping
+    db_session.bulk_insert_mappings(User, rows)
     db_session.commit()
+    usernames = [row["username"] for row in rows]
+    users = db_session.query(User).filter(User.username.in_(usernames)).all()
     logger.info(f"Seeded {len(users)} users.")
     return users
 
 # ======================================================================================
-# FastAPI Server Fixture
+# In-Process API Client
+# ======================================================================================
+@pytest.fixture(scope="session")
+def app_instance():
+    """Import and build the FastAPI app once per session (once per xdist worker)."""
+    from app.main import app
+    return app
+
+@pytest.fixture(scope="session")
+def client(app_instance, setup_test_database):
+    """
+    Provide an in-process client for API tests (session-scoped).
+    Requests go straight to the ASGI app - no subprocess, socket or port.
+    Not entered as a context manager: the app's lifespan would create tables
+    on the application database rather than the test one.
+    """
+    from fastapi.testclient import TestClient
+
+    test_client = TestClient(app_instance)
+    try:
+        yield test_client
+    finally:
+        test_client.close()
+
+@pytest.fixture
+def api_client(app_instance, client, db_session):
+    """
+    Provide the in-process API client with the app's get_db pointed at this
+    test's db_session, so requests see (and roll back with) the test's data.
+    The cached user snapshots are cleared around each test for the same reason.
+    """
+    # Take get_db from app.main: test_database reloads app.database, and the
+    # override must be keyed on the function the routes actually depend on.
+    from app.main import get_db
+    from app.models.user_cache import clear_user_cache
+
+    # The user cache is process-wide and would outlive this test's rollback
+    clear_user_cache()
+    app_instance.dependency_overrides[get_db] = lambda: db_session
+    try:
+        yield client
+    finally:
+        app_instance.dependency_overrides.pop(get_db, None)
+        clear_user_cache()
+
+# ======================================================================================
+# FastAPI Server Fixture (Playwright UI tests only)
 # ======================================================================================
+# Set by pytest-xdist in each worker process; a plain run behaves like worker gw0.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+XDIST_WORKER_INDEX = int(XDIST_WORKER[2:] or 0)
+
+def _schema_cache_key(project_root: Path) -> str:
+    """Hash the model and migration sources; any schema change yields a new key."""
+    digest = hashlib.sha1()
+    for source in sorted((project_root / "app" / "models").glob("*.py")) + sorted(
+        (project_root / "alembic" / "versions").glob("*.py")
+    ):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+def restore_cached_e2e_db(project_root: Path, db_path: Path) -> bool:
+    """
+    Copy a pre-built empty E2E database into place when E2E_CACHE_DB=1.
+    The snapshot lives in var/test-db-caches and is built with create_all the
+    first time a given schema is seen. Returns True if a snapshot was used.
+    """
+    if os.environ.get("E2E_CACHE_DB") != "1":
+        return False
+
+    cache_dir = project_root / "var" / "test-db-caches"
+    cache_file = cache_dir / f"{_schema_cache_key(project_root)}.db"
+    if not cache_file.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Build under a per-worker name, then rename, so xdist workers never
+        # copy a half-written snapshot.
+        tmp_file = cache_dir / f"{cache_file.stem}.{XDIST_WORKER}.tmp"
+        tmp_file.unlink(missing_ok=True)
+        engine = create_engine(f"sqlite:///{tmp_file}")
+        try:
+            Base.metadata.create_all(bind=engine)
+        finally:
+            engine.dispose()
+        tmp_file.replace(cache_file)
+        logger.info(f"Cached E2E database snapshot {cache_file.name}")
+
+    shutil.copyfile(cache_file, db_path)
+    return True
+
 def find_available_port() -> int:
     """Find an available port for the test server by binding to port 0."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(('', 0))
         return s.getsockname()[1]
 
+# The user pre-seeded into the E2E template database (password: TestPass123).
+SEED_USER = {
+    "first_name": "Seed",
+    "last_name": "User",
+    "email": f"seed_{XDIST_WORKER}@example.com",
+    "username": f"seeduser_{XDIST_WORKER}",
+}
+
+@pytest.fixture(scope="session")
+def seed_template_db(tmp_path_factory, _test_password_hash) -> Path:
+    """
+    Build the E2E database template once per session: the schema (from the
+    snapshot cache when E2E_CACHE_DB=1) plus SEED_USER. fastapi_server copies
+    it into place instead of rebuilding, and the shared E2E user comes from it
+    instead of a registration round-trip.
+    """
+    project_root = Path(__file__).resolve().parents[1]
+    template = tmp_path_factory.mktemp("seed") / "seed.db"
+
+    engine = create_engine(f"sqlite:///{template}")
+    try:
+        if not restore_cached_e2e_db(project_root, template):
+            Base.metadata.create_all(bind=engine)
+        with get_sessionmaker(engine=engine)() as session:
+            session.add(User(**SEED_USER, password=_test_password_hash))
+            session.commit()
+    finally:
+        engine.dispose()
+    return template
+
 @pytest.fixture(scope="session")
-def fastapi_server():
+def fastapi_server(seed_template_db):
     """
-    Start a FastAPI test server in a subprocess. If the chosen port (default: 8000)
-    is already in use, find another available port. Wait until the server is up
-    before yielding its base URL.
+    Start a FastAPI test server in a subprocess. Each xdist worker gets its own
+    port (5555 + worker index) and a copy of the seeded template database; if
+    the chosen port is already in use, find another available port. Wait until
+    the server is up before yielding its base URL.
     """
-    base_port = 5555  # Use different port to avoid conflicts
+    # Use different port to avoid conflicts; one per xdist worker
+    base_port = 5555 + XDIST_WORKER_INDEX
     server_url = f'http://127.0.0.1:{base_port}/'
 
     # Check if port is free; if not, pick an available port
@@ -275,20 +477,17 @@ def fastapi_server():
 
     project_root = Path(__file__).resolve().parents[1]
     
-    # Use environment variable to set a different database for E2E tests
+    # Use environment variable to set a different database for E2E tests.
+    # Each xdist worker runs its own server, so each gets its own file.
+    db_name = f"test_e2e_{XDIST_WORKER}.db"
     env = os.environ.copy()
-    env['DATABASE_URL'] = 'sqlite:///test_e2e.db'
+    env['DATABASE_URL'] = f'sqlite:///{db_name}'
     
     # Clean up old database file before starting
-    test_db_path = project_root / "test_e2e.db"
-    for ext in ['', '-shm', '-wal']:
-        db_file = Path(str(test_db_path) + ext)
-        if db_file.exists():
-            try:
-                db_file.unlink()
-                logger.info(f"Cleaned up {db_file}")
-            except Exception as e:
-                logger.warning(f"Could not delete {db_file}: {e}")
+    db_files = [project_root / f"{db_name}{ext}" for ext in ("", "-shm", "-wal")]
+    for db_file in db_files:
+        db_file.unlink(missing_ok=True)
+    shutil.copyfile(seed_template_db, db_files[0])
     
     uvicorn_cmd = [
         sys.executable,
@@ -331,85 +530,198 @@ def fastapi_server():
         logger.warning("Test server forcefully stopped.")
     
     # Clean up test database after tests
-    test_db_path = project_root / "test_e2e.db"
-    for ext in ['', '-shm', '-wal']:
-        db_file = Path(str(test_db_path) + ext)
-        if db_file.exists():
-            try:
-                db_file.unlink()
-            except Exception:
-                pass
+    for db_file in db_files:
+        db_file.unlink(missing_ok=True)
 
 # ======================================================================================
 # Playwright Fixtures for UI Testing
 # ======================================================================================
+def _browsers_from_env() -> List[str]:
+    """Browsers to run UI tests in: Chromium unless E2E_BROWSERS=all (nightly CI)."""
+    if os.environ.get("E2E_BROWSERS", "chromium") == "all":
+        return ["chromium", "firefox", "webkit"]
+    return ["chromium"]
+
+@pytest.fixture(scope="session", params=_browsers_from_env())
+def browser_name(request) -> str:
+    """Name of the Playwright browser type UI tests run in."""
+    return request.param
+
 @pytest.fixture(scope="session")
-def browser_context():
-    """Provide a Playwright browser context for UI tests (session-scoped)."""
+def browser(browser_name):
+    """
+    Provide a Playwright browser for UI tests (session-scoped).
+    Session scope is per process, so under pytest-xdist (-n auto) each worker
+    launches its own browser and its tests share it; tests only ever open
+    contexts and pages in it.
+    """
     from playwright.sync_api import sync_playwright
     
+    launch_args = []
+    if browser_name == "chromium":
+        launch_args = ['--headless=new', '--no-sandbox', '--disable-dev-shm-usage']
+
     with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(
+        browser = getattr(playwright, browser_name).launch(
             headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
+            args=launch_args
         )
-        logger.info("Playwright browser launched.")
+        logger.info(f"Playwright {browser_name} launched for worker {XDIST_WORKER}.")
         try:
             yield browser
         finally:
-            logger.info("Closing Playwright browser.")
+            logger.info(f"Closing Playwright {browser_name}.")
             browser.close()
 
-@pytest.fixture
-def page(browser_context):
+BROWSER_CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'ignore_https_errors': True,
+}
+
+# localStorage keys the login page stores, mapped from the /auth/login response.
+_LOGIN_STORAGE_KEYS = {
+    'access_token': 'access_token',
+    'refresh_token': 'refresh_token',
+    'token_expires': 'expires_at',
+    'user_id': 'user_id',
+    'username': 'username',
+    'first_name': 'first_name',
+}
+
+def api_login(page, base_url: str, credentials: Dict[str, str]) -> None:
     """
-    Provide a new browser page for each test, with a standard viewport.
-    Closes the page and context after each test.
+    Log in through /auth/login and seed the tokens into the page's localStorage,
+    the way the login page does, without driving the login form.
+    The seeding runs on the page's first load of the app only, so a later
+    logout or re-login in the test isn't undone by the next navigation.
     """
-    context = browser_context.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        ignore_https_errors=True
+    response = page.request.post(
+        f"{base_url}auth/login",
+        data={"username": credentials["username"], "password": credentials["password"]},
     )
-    page = context.new_page()
+    assert response.ok, f"API login failed: {response.status} - {response.text()}"
+    token_data = response.json()
+    items = {key: str(token_data[field]) for key, field in _LOGIN_STORAGE_KEYS.items()}
+
+    parsed = urlparse(base_url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    page.add_init_script(f"""
+        (() => {{
+            if (window.location.origin !== {json.dumps(origin)}) return;
+            if (sessionStorage.getItem('e2e_auth_seeded')) return;
+            for (const [key, value] of Object.entries({json.dumps(items)})) {{
+                localStorage.setItem(key, value);
+            }}
+            sessionStorage.setItem('e2e_auth_seeded', '1');
+        }})();
+    """)
+
+@pytest.fixture(scope="session")
+def auth_state(browser, base_url, shared_user_credentials):
+    """
+    Log the shared test user in once and return the resulting storage state
+    (the tokens the login page keeps in localStorage).
+    """
+    context = browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+    try:
+        page = context.new_page()
+        api_login(page, base_url, shared_user_credentials)
+        page.goto(f"{base_url}dashboard")
+        return context.storage_state()
+    finally:
+        context.close()
+
+@pytest.fixture(scope="session")
+def shared_context(browser, auth_state):
+    """
+    Provide one browser context shared by every test in the session, already
+    logged in as the shared test user.
+    Context creation is the slow Playwright operation, so tests that don't need
+    storage isolation only open a new page in it.
+    """
+    context = browser.new_context(storage_state=auth_state, **BROWSER_CONTEXT_OPTIONS)
+    try:
+        yield context
+    finally:
+        logger.info("Closing shared browser context.")
+        context.close()
+
+@pytest.fixture(scope="session")
+def anonymous_context(browser):
+    """
+    Provide one logged-out browser context, reused by tests that log in as
+    their own user. Cheaper than a new context per test; page clears its
+    storage between tests.
+    """
+    context = browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+    try:
+        yield context
+    finally:
+        logger.info("Closing anonymous browser context.")
+        context.close()
+
+@pytest.fixture
+def page(request, browser_name):
+    """
+    Provide a new browser page for each test in the shared, logged-in context.
+    Cookies and localStorage persist between tests. Tests marked
+    no_shared_auth get a page in the logged-out anonymous_context instead,
+    with its cookies, permissions and localStorage cleared around the test.
+    """
+    if request.node.get_closest_marker("no_shared_auth"):
+        context = request.getfixturevalue("anonymous_context")
+        context.clear_cookies()
+        context.clear_permissions()
+        page = context.new_page()
+        try:
+            yield page
+        finally:
+            # The app keeps its tokens in localStorage, which clear_cookies()
+            # doesn't touch; drop them before the next test reuses the context.
+            if page.url.startswith("http"):
+                page.evaluate("localStorage.clear()")
+            page.close()
+        return
+
+    page = request.getfixturevalue("shared_context").new_page()
     logger.info("New browser page created.")
     try:
         yield page
     finally:
-        logger.info("Closing browser page and context.")
+        logger.info("Closing browser page.")
         page.close()
-        context.close()
+
+# One keep-alive connection pool for every E2E user registration.
+_api_session = requests.Session()
+_api_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_api_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 @pytest.fixture(scope="session")
-def base_url(fastapi_server):
+def base_url(request):
     """
-    Provide the base URL for E2E tests.
-    Depends on fastapi_server fixture to ensure server is running.
+    Provide the base URL for E2E tests: the server given with --base-url, or
+    else the auto-started fastapi_server (only started when needed).
     """
-    return fastapi_server
+    external_url = request.config.getoption("--base-url")
+    if external_url:
+        return external_url.rstrip("/") + "/"
+    return request.getfixturevalue("fastapi_server")
 
-@pytest.fixture
-def test_user_credentials(base_url):
+def register_test_user(base_url: str) -> Dict[str, str]:
     """
-    Create a test user via API and return credentials for E2E tests.
-    This fixture registers a user through the running E2E server.
-    If user already exists (e.g., testing against external server), try to use them.
+    Register a user via API and return its credentials for E2E tests.
+    A random suffix keeps names from colliding, even against an external server.
     """
-    import requests
-    from faker import Faker
-    import time
-    fake = Faker()
-    
-    # Use a timestamp-based username to avoid collisions
-    timestamp = int(time.time())
-    username = f"testuser{timestamp}"
-    email = f"test{timestamp}@example.com"
+    suffix = f"{XDIST_WORKER}{uuid4().hex[:12]}"
+    username = f"testuser{suffix}"
+    email = f"test{suffix}@example.com"
     password = "TestPass123!"
     
     # Ensure base_url ends with /
     url = base_url if base_url.endswith('/') else f"{base_url}/"
     
     # Register user through API
-    response = requests.post(
+    response = _api_session.post(
         f"{url}auth/register",
         json={
             "first_name": "Test",
@@ -418,31 +730,11 @@ def test_user_credentials(base_url):
             "username": username,
             "password": password,
             "confirm_password": password
-        }
+        },
+        timeout=5,
     )
-    
     if response.status_code not in [200, 201]:
-        # If user exists, that's okay for external servers
-        if "already exists" in response.text.lower():
-            logger.warning(f"User {username} already exists, trying different username")
-            # Try with a more unique identifier
-            username = f"testuser{timestamp}_{fake.random_int(1000, 9999)}"
-            email = f"test{timestamp}_{fake.random_int(1000, 9999)}@example.com"
-            response = requests.post(
-                f"{url}auth/register",
-                json={
-                    "first_name": "Test",
-                    "last_name": "User",
-                    "email": email,
-                    "username": username,
-                    "password": password,
-                    "confirm_password": password
-                }
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Failed to create test user: {response.status_code} - {response.text}")
-        else:
-            raise Exception(f"Failed to create test user: {response.status_code} - {response.text}")
+        raise Exception(f"Failed to create test user: {response.status_code} - {response.text}")
     
     return {
         "username": username,
@@ -452,6 +744,25 @@ def test_user_credentials(base_url):
         "last_name": "User"
     }
 
+@pytest.fixture
+def test_user_credentials(base_url):
+    """
+    Create a fresh test user for one E2E test, for tests that change the
+    user's password or otherwise can't share the session user.
+    """
+    return register_test_user(base_url)
+
+@pytest.fixture(scope="session")
+def shared_user_credentials(request, base_url):
+    """
+    Return the user that the shared, logged-in browser context belongs to:
+    SEED_USER on the auto-started server, or a freshly registered user when
+    testing against an external server (--base-url).
+    """
+    if request.config.getoption("--base-url"):
+        return register_test_user(base_url)
+    return {**SEED_USER, "password": "TestPass123"}
+
 # ======================================================================================
 # Pytest Command-Line Options
 # ======================================================================================
@@ -460,9 +771,16 @@ def pytest_addoption(parser):
     Add custom command line options:
       --preserve-db : Keep test database after tests
       --run-slow    : Run tests marked as 'slow'
+      --base-url    : Run E2E tests against an already running server
     """
     parser.addoption("--preserve-db", action="store_true", help="Keep test database after tests")
     parser.addoption("--run-slow", action="store_true", help="Run tests marked as slow")
+    parser.addoption(
+        "--base-url",
+        action="store",
+        default=None,
+        help="Base URL of the running server for E2E tests (e.g., http://localhost:8080)",
+    )
 
 def pytest_collection_modifyitems(config, items):
     """
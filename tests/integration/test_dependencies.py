@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import patch
 from fastapi import HTTPException, status
-from app.auth.dependencies import get_current_user, get_current_active_user
+from app.auth.dependencies import _decoded_token, get_current_user, get_current_active_user
 from app.schemas.user import UserResponse
 from app.models.user import User
 from uuid import uuid4
@@ -42,7 +42,7 @@ def mock_verify_token():
 def test_get_current_user_valid_token_existing_user(mock_verify_token):
     mock_verify_token.return_value = sample_user_data
 
-    user_response = get_current_user(token="validtoken")
+    user_response = get_current_user(token_data=_decoded_token(token="validtoken"))
 
     assert isinstance(user_response, UserResponse)
     assert user_response.id == sample_user_data["id"]
@@ -62,7 +62,7 @@ def test_get_current_user_invalid_token(mock_verify_token):
     mock_verify_token.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_user(token="invalidtoken")
+        _decoded_token(token="invalidtoken")
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
@@ -75,18 +75,41 @@ def test_get_current_user_valid_token_incomplete_payload(mock_verify_token):
     mock_verify_token.return_value = {}
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_user(token="validtoken")
+        get_current_user(token_data=_decoded_token(token="validtoken"))
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
 
     mock_verify_token.assert_called_once_with("validtoken")
 
+# Test get_current_user with a minimal payload (UUID or dict with only 'sub')
+@pytest.mark.parametrize("as_dict", [False, True])
+def test_get_current_user_minimal_payload(mock_verify_token, as_dict):
+    user_id = uuid4()
+    mock_verify_token.return_value = {"sub": str(user_id)} if as_dict else user_id
+
+    user_response = get_current_user(token_data=_decoded_token(token="validtoken"))
+
+    assert isinstance(user_response, UserResponse)
+    assert user_response.id == user_id
+    assert user_response.username == "unknown"
+    assert user_response.is_active is True
+
+# Test get_current_user rejects a malformed 'sub' before parsing it
+@pytest.mark.parametrize("sub", ["not-a-uuid", "", 12345, "1" * 5000])
+def test_get_current_user_malformed_sub(mock_verify_token, sub):
+    mock_verify_token.return_value = {"sub": sub}
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user(token_data=_decoded_token(token="validtoken"))
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
 # Test get_current_active_user with an active user
 def test_get_current_active_user_active(mock_verify_token):
     mock_verify_token.return_value = sample_user_data
 
-    current_user = get_current_user(token="validtoken")
+    current_user = get_current_user(token_data=_decoded_token(token="validtoken"))
     active_user = get_current_active_user(current_user=current_user)
 
     assert isinstance(active_user, UserResponse)
@@ -96,10 +119,31 @@ def test_get_current_active_user_active(mock_verify_token):
 def test_get_current_active_user_inactive(mock_verify_token):
     mock_verify_token.return_value = inactive_user_data
 
-    current_user = get_current_user(token="validtoken")
+    current_user = get_current_user(token_data=_decoded_token(token="validtoken"))
 
     with pytest.raises(HTTPException) as exc_info:
         get_current_active_user(current_user=current_user)
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
     assert exc_info.value.detail == "Inactive user"
+
+def test_user_cache_invalidated_after_commit_not_before(db_session, test_user):
+    """
+    A lookup that lands between an update's flush and its commit caches the
+    row again; the invalidation must run on commit so that entry is dropped.
+    """
+    from app.auth.dependencies import get_current_user_from_db
+    from app.models.user_cache import clear_user_cache, get_cached_user
+
+    clear_user_cache()
+    try:
+        test_user.update_profile(db_session, {"first_name": "Committed"})
+        db_session.flush()
+
+        get_current_user_from_db(user_id=test_user.id, db=db_session)
+        assert get_cached_user(test_user.id) is not None
+
+        db_session.commit()
+        assert get_cached_user(test_user.id) is None
+    finally:
+        clear_user_cache()
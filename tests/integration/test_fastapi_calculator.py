@@ -1,7 +1,6 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 import pytest
-import requests
 
 # Import the Calculation model for direct model tests.
 from app.models.calculation import Calculation
@@ -9,48 +8,41 @@ from app.models.calculation import Calculation
 # ---------------------------------------------------------------------------
 # Helper Fixtures and Functions
 # ---------------------------------------------------------------------------
-@pytest.fixture
-def base_url(fastapi_server: str) -> str:
-    """
-    Returns the FastAPI server base URL without a trailing slash.
-    """
-    return fastapi_server.rstrip("/")
-
 def _parse_datetime(dt_str: str) -> datetime:
     """Helper function to parse datetime strings from API responses."""
     if dt_str.endswith('Z'):
         dt_str = dt_str.replace('Z', '+00:00')
     return datetime.fromisoformat(dt_str)
 
-def register_and_login(base_url: str, user_data: dict) -> dict:
+def register_and_login(api_client, user_data: dict) -> dict:
     """
     Registers a new user and logs in, returning the token response data.
     """
-    reg_url = f"{base_url}/auth/register"
-    login_url = f"{base_url}/auth/login"
+    reg_url = "/auth/register"
+    login_url = "/auth/login"
     
-    reg_response = requests.post(reg_url, json=user_data)
+    reg_response = api_client.post(reg_url, json=user_data)
     assert reg_response.status_code == 201, f"User registration failed: {reg_response.text}"
     
     login_payload = {
         "username": user_data["username"],
         "password": user_data["password"]
     }
-    login_response = requests.post(login_url, json=login_payload)
+    login_response = api_client.post(login_url, json=login_payload)
     assert login_response.status_code == 200, f"Login failed: {login_response.text}"
     return login_response.json()
 
 # ---------------------------------------------------------------------------
 # Health and Auth Endpoint Tests
 # ---------------------------------------------------------------------------
-def test_health_endpoint(base_url: str):
-    url = f"{base_url}/health"
-    response = requests.get(url)
+def test_health_endpoint(api_client):
+    url = "/health"
+    response = api_client.get(url)
     assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}. Response: {response.text}"
     assert response.json() == {"status": "ok"}, "Unexpected response from /health."
 
-def test_user_registration(base_url: str):
-    url = f"{base_url}/auth/register"
+def test_user_registration(api_client):
+    url = "/auth/register"
     payload = {
         "first_name": "Alice",
         "last_name": "Smith",
@@ -59,7 +51,7 @@ def test_user_registration(base_url: str):
         "password": "SecurePass123!",
         "confirm_password": "SecurePass123!"
     }
-    response = requests.post(url, json=payload)
+    response = api_client.post(url, json=payload)
     assert response.status_code == 201, f"Expected 201 but got {response.status_code}. Response: {response.text}"
     data = response.json()
     for key in ["id", "username", "email", "first_name", "last_name", "is_active", "is_verified"]:
@@ -71,9 +63,9 @@ def test_user_registration(base_url: str):
     assert data["is_active"] is True
     assert data["is_verified"] is False
 
-def test_user_login(base_url: str):
-    reg_url = f"{base_url}/auth/register"
-    login_url = f"{base_url}/auth/login"
+def test_user_login(api_client):
+    reg_url = "/auth/register"
+    login_url = "/auth/login"
     
     test_user = {
         "first_name": "Bob",
@@ -85,7 +77,7 @@ def test_user_login(base_url: str):
     }
     
     # Register user
-    reg_response = requests.post(reg_url, json=test_user)
+    reg_response = api_client.post(reg_url, json=test_user)
     assert reg_response.status_code == 201, f"User registration failed: {reg_response.text}"
     
     # Login user
@@ -93,7 +85,7 @@ def test_user_login(base_url: str):
         "username": test_user["username"],
         "password": test_user["password"]
     }
-    login_response = requests.post(login_url, json=login_payload)
+    login_response = api_client.post(login_url, json=login_payload)
     assert login_response.status_code == 200, f"Login failed: {login_response.text}"
     
     login_data = login_response.json()
@@ -134,7 +126,7 @@ def test_user_login(base_url: str):
 # Calculations Endpoints Integration Tests
 # ---------------------------------------------------------------------------
 # Note: All calculation creation requests now use the /calculations endpoint (not /calculations/add)
-def test_create_calculation_addition(base_url: str):
+def test_create_calculation_addition(api_client):
     user_data = {
         "first_name": "Calc",
         "last_name": "Adder",
@@ -143,21 +135,21 @@ def test_create_calculation_addition(base_url: str):
         "password": "SecurePass123!",
         "confirm_password": "SecurePass123!"
     }
-    token_data = register_and_login(base_url, user_data)
+    token_data = register_and_login(api_client, user_data)
     access_token = token_data["access_token"]
     headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"{base_url}/calculations"
+    url = "/calculations"
     payload = {
         "type": "addition",
         "inputs": [10.5, 3, 2],
         "user_id": "ignored"
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = api_client.post(url, json=payload, headers=headers)
     assert response.status_code == 201, f"Addition calculation creation failed: {response.text}"
     data = response.json()
     assert "result" in data and data["result"] == 15.5, f"Expected result 15.5, got {data.get('result')}"
 
-def test_create_calculation_subtraction(base_url: str):
+def test_create_calculation_subtraction(api_client):
     user_data = {
         "first_name": "Calc",
         "last_name": "Subtractor",
@@ -166,22 +158,22 @@ def test_create_calculation_subtraction(base_url: str):
         "password": "SecurePass123!",
         "confirm_password": "SecurePass123!"
     }
-    token_data = register_and_login(base_url, user_data)
+    token_data = register_and_login(api_client, user_data)
     access_token = token_data["access_token"]
     headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"{base_url}/calculations"
+    url = "/calculations"
     payload = {
         "type": "subtraction",
         "inputs": [10, 3, 2],
         "user_id": "ignored"
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = api_client.post(url, json=payload, headers=headers)
     assert response.status_code == 201, f"Subtraction calculation creation failed: {response.text}"
     data = response.json()
     # Expected result: 10 - 3 - 2 = 5
     assert "result" in data and data["result"] == 5, f"Expected result 5, got {data.get('result')}"
 
-def test_create_calculation_multiplication(base_url: str):
+def test_create_calculation_multiplication(api_client):
     user_data = {
         "first_name": "Calc",
         "last_name": "Multiplier",
@@ -190,22 +182,22 @@ def test_create_calculation_multiplication(base_url: str):
         "password": "SecurePass123!",
         "confirm_password": "SecurePass123!"
     }
-    token_data = register_and_login(base_url, user_data)
+    token_data = register_and_login(api_client, user_data)
     access_token = token_data["access_token"]
     headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"{base_url}/calculations"
+    url = "/calculations"
     payload = {
         "type": "multiplication",
         "inputs": [2, 3, 4],
         "user_id": "ignored"
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = api_client.post(url, json=payload, headers=headers)
     assert response.status_code == 201, f"Multiplication calculation creation failed: {response.text}"
     data = response.json()
     # Expected result: 2 * 3 * 4 = 24
     assert "result" in data and data["result"] == 24, f"Expected result 24, got {data.get('result')}"
 
-def test_create_calculation_division(base_url: str):
+def test_create_calculation_division(api_client):
     user_data = {
         "first_name": "Calc",
         "last_name": "Divider",
@@ -214,22 +206,22 @@ def test_create_calculation_division(base_url: str):
         "password": "SecurePass123!",
         "confirm_password": "SecurePass123!"
     }
-    token_data = register_and_login(base_url, user_data)
+    token_data = register_and_login(api_client, user_data)
     access_token = token_data["access_token"]
     headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"{base_url}/calculations"
+    url = "/calculations"
     payload = {
         "type": "division",
         "inputs": [100, 2, 5],
         "user_id": "ignored"
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = api_client.post(url, json=payload, headers=headers)
     assert response.status_code == 201, f"Division calculation creation failed: {response.text}"
     data = response.json()
     # Expected result: 100 / 2 / 5 = 10
     assert "result" in data and data["result"] == 10, f"Expected result 10, got {data.get('result')}"
 
-def test_list_get_update_delete_calculation(base_url: str):
+def test_list_get_update_delete_calculation(api_client):
     user_data = {
         "first_name": "Calc",
         "last_name": "CRUD",
@@ -238,40 +230,40 @@ def test_list_get_update_delete_calculation(base_url: str):
         "password": "SecurePass123!",
         "confirm_password": "SecurePass123!"
     }
-    token_data = register_and_login(base_url, user_data)
+    token_data = register_and_login(api_client, user_data)
     access_token = token_data["access_token"]
     headers = {"Authorization": f"Bearer {access_token}"}
     
     # Create a calculation (e.g., multiplication)
-    create_url = f"{base_url}/calculations"
+    create_url = "/calculations"
     payload = {
         "type": "multiplication",
         "inputs": [3, 4],
         "user_id": "ignored"
     }
-    create_response = requests.post(create_url, json=payload, headers=headers)
+    create_response = api_client.post(create_url, json=payload, headers=headers)
     assert create_response.status_code == 201, f"Calculation creation failed: {create_response.text}"
     calc = create_response.json()
     calc_id = calc["id"]
     
     # List calculations
-    list_url = f"{base_url}/calculations"
-    list_response = requests.get(list_url, headers=headers)
+    list_url = "/calculations"
+    list_response = api_client.get(list_url, headers=headers)
     assert list_response.status_code == 200, f"List calculations failed: {list_response.text}"
     calc_list = list_response.json()
     assert any(c["id"] == calc_id for c in calc_list), "Created calculation not found in list"
     
     # Get calculation by ID
-    get_url = f"{base_url}/calculations/{calc_id}"
-    get_response = requests.get(get_url, headers=headers)
+    get_url = f"/calculations/{calc_id}"
+    get_response = api_client.get(get_url, headers=headers)
     assert get_response.status_code == 200, f"Get calculation failed: {get_response.text}"
     get_calc = get_response.json()
     assert get_calc["id"] == calc_id, "Mismatch in calculation id"
     
     # Update calculation: change inputs (e.g., from [3,4] to [5,6])
-    update_url = f"{base_url}/calculations/{calc_id}"
+    update_url = f"/calculations/{calc_id}"
     update_payload = {"inputs": [5, 6]}
-    update_response = requests.put(update_url, json=update_payload, headers=headers)
+    update_response = api_client.put(update_url, json=update_payload, headers=headers)
     assert update_response.status_code == 200, f"Update calculation failed: {update_response.text}"
     updated_calc = update_response.json()
     # For multiplication, expected result = 5 * 6 = 30
@@ -279,12 +271,12 @@ def test_list_get_update_delete_calculation(base_url: str):
     assert updated_calc["result"] == expected_result, f"Expected updated result {expected_result}, got {updated_calc['result']}"
     
     # Delete calculation
-    delete_url = f"{base_url}/calculations/{calc_id}"
-    delete_response = requests.delete(delete_url, headers=headers)
+    delete_url = f"/calculations/{calc_id}"
+    delete_response = api_client.delete(delete_url, headers=headers)
     assert delete_response.status_code == 204, f"Delete calculation failed: {delete_response.text}"
     
     # Verify deletion: GET should return 404
-    get_response_after_delete = requests.get(get_url, headers=headers)
+    get_response_after_delete = api_client.get(get_url, headers=headers)
     assert get_response_after_delete.status_code == 404, "Expected 404 after deletion"
 
 # ---------------------------------------------------------------------------
@@ -1,86 +1,82 @@
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
+from app.main import app, get_db
 from app.models.user import User
 
-client = TestClient(app)
-
-def test_get_current_user_profile(db_session, test_user):
+def test_get_current_user_profile(api_client, db_session, test_user, auth_headers):
     """Test getting current user profile"""
-    # Create access token
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    response = client.get(
+    # Snapshot first: a cached lookup merges into the identity-mapped test_user,
+    # so comparing against it afterwards would hide stale data
+    fields = ("username", "email", "first_name", "last_name")
+    expected = {field: getattr(test_user, field) for field in fields}
+
+    response = api_client.get(
         "/users/me",
-        headers={"Authorization": f"Bearer {token}"}
+        headers=auth_headers
     )
     
     assert response.status_code == 200
     data = response.json()
-    assert data["username"] == test_user.username
-    assert data["email"] == test_user.email
-    assert data["first_name"] == test_user.first_name
-    assert data["last_name"] == test_user.last_name
+    assert {field: data[field] for field in fields} == expected
 
-def test_get_current_user_profile_unauthorized():
+def test_get_current_user_profile_unauthorized(api_client):
     """Test getting profile without authentication"""
-    response = client.get("/users/me")
+    response = api_client.get("/users/me")
     
     assert response.status_code == 401
 
-def test_update_user_profile_success(db_session, test_user):
-    """Test successful profile update"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    update_data = {
-        "first_name": "UpdatedFirst",
-        "last_name": "UpdatedLast"
-    }
-    
-    response = client.put(
+def test_invalid_token_does_not_open_db_session(api_client):
+    """Test that a bad token is rejected before a DB session is created"""
+    opened = []
+
+    def tracking_get_db():
+        opened.append(True)
+        yield None
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = tracking_get_db
+    try:
+        response = api_client.get(
+            "/users/me",
+            headers={"Authorization": "Bearer not.a.token"}
+        )
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
+
+    assert response.status_code == 401
+    assert opened == []
+
+@pytest.mark.parametrize("field,value", [
+    ("first_name", "UpdatedFirst"),
+    ("last_name", "UpdatedLast"),
+    ("username", "newusername123"),
+    ("email", "newemail@example.com"),
+])
+def test_update_user_profile_field(api_client, db_session, auth_headers, field, value):
+    """Test updating each profile field"""
+    response = api_client.put(
         "/users/me",
-        headers={"Authorization": f"Bearer {token}"},
-        json=update_data
+        headers=auth_headers,
+        json={field: value}
     )
     
     assert response.status_code == 200
-    data = response.json()
-    assert data["first_name"] == "UpdatedFirst"
-    assert data["last_name"] == "UpdatedLast"
+    assert response.json()[field] == value
 
-def test_update_user_profile_username(db_session, test_user):
-    """Test updating username"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    update_data = {"username": "newusername123"}
-    
-    response = client.put(
-        "/users/me",
-        headers={"Authorization": f"Bearer {token}"},
-        json=update_data
-    )
-    
+def test_update_user_profile_visible_after_cached_lookup(api_client, db_session, auth_headers):
+    """Test profile updates persist and are not hidden by the cached user"""
+    # Prime the user cache, then update through a cached lookup
+    assert api_client.get("/users/me", headers=auth_headers).status_code == 200
+    response = api_client.put("/users/me", headers=auth_headers, json={"first_name": "Cached"})
     assert response.status_code == 200
-    data = response.json()
-    assert data["username"] == "newusername123"
 
-def test_update_user_profile_email(db_session, test_user):
-    """Test updating email"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    update_data = {"email": "newemail@example.com"}
-    
-    response = client.put(
-        "/users/me",
-        headers={"Authorization": f"Bearer {token}"},
-        json=update_data
-    )
-    
+    response = api_client.get("/users/me", headers=auth_headers)
     assert response.status_code == 200
-    data = response.json()
-    assert data["email"] == "newemail@example.com"
+    assert response.json()["first_name"] == "Cached"
 
-def test_update_user_profile_duplicate_username(db_session):
+def test_update_user_profile_duplicate_username(api_client, db_session):
     """Test updating to existing username fails"""
     # Create first user
     user1_data = {
@@ -106,7 +102,7 @@ def test_update_user_profile_duplicate_username(db_session):
     
     token = User.create_access_token({"sub": str(user2.id)})
     
-    response = client.put(
+    response = api_client.put(
         "/users/me",
         headers={"Authorization": f"Bearer {token}"},
         json={"username": "user1"}
@@ -115,123 +111,61 @@ def test_update_user_profile_duplicate_username(db_session):
     assert response.status_code == 400
     assert "already exists" in response.json()["detail"]
 
-def test_update_user_profile_no_fields(db_session, test_user):
+def test_update_user_profile_no_fields(api_client, db_session, auth_headers):
     """Test updating with no fields returns error"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    response = client.put(
+    response = api_client.put(
         "/users/me",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json={}
     )
     
     assert response.status_code == 400
     assert "No fields provided" in response.json()["detail"]
 
-def test_change_password_success(db_session, test_user):
+def test_change_password_success(api_client, db_session, auth_headers):
     """Test successful password change"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
     password_data = {
         "current_password": "TestPass123",
         "new_password": "NewPass456",
         "confirm_new_password": "NewPass456"
     }
     
-    response = client.post(
+    response = api_client.post(
         "/users/me/change-password",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json=password_data
     )
     
     assert response.status_code == 200
     assert "success" in response.json()["message"].lower()
 
-def test_change_password_wrong_current(db_session, test_user):
+def test_change_password_wrong_current(api_client, db_session, auth_headers):
     """Test password change with wrong current password"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
     password_data = {
         "current_password": "WrongPassword",
         "new_password": "NewPass456",
         "confirm_new_password": "NewPass456"
     }
     
-    response = client.post(
+    response = api_client.post(
         "/users/me/change-password",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json=password_data
     )
     
     assert response.status_code == 400
     assert "incorrect" in response.json()["detail"].lower()
 
-def test_change_password_mismatch(db_session, test_user):
-    """Test password change with mismatched new passwords"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    password_data = {
-        "current_password": "TestPass123",
-        "new_password": "NewPass456",
-        "confirm_new_password": "DifferentPass789"
-    }
-    
-    response = client.post(
-        "/users/me/change-password",
-        headers={"Authorization": f"Bearer {token}"},
-        json=password_data
-    )
-    
-    assert response.status_code == 422  # Validation error from Pydantic
-
-def test_change_password_same_as_old(db_session, test_user):
-    """Test password change with same password"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    password_data = {
-        "current_password": "TestPass123",
-        "new_password": "TestPass123",
-        "confirm_new_password": "TestPass123"
-    }
-    
-    response = client.post(
-        "/users/me/change-password",
-        headers={"Authorization": f"Bearer {token}"},
-        json=password_data
-    )
-    
-    assert response.status_code == 422  # Validation error from Pydantic
-
-def test_change_password_too_short(db_session, test_user):
-    """Test password change with short password"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
-    password_data = {
-        "current_password": "TestPass123",
-        "new_password": "short",
-        "confirm_new_password": "short"
-    }
-    
-    response = client.post(
-        "/users/me/change-password",
-        headers={"Authorization": f"Bearer {token}"},
-        json=password_data
-    )
-    
-    assert response.status_code == 400 or response.status_code == 422
-
-def test_create_calculation_exponentiation(db_session, test_user):
+def test_create_calculation_exponentiation(api_client, db_session, auth_headers):
     """Test creating exponentiation calculation"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
     calc_data = {
         "type": "exponentiation",
         "inputs": [2, 3]
     }
     
-    response = client.post(
+    response = api_client.post(
         "/calculations",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json=calc_data
     )
     
@@ -240,18 +174,16 @@ def test_create_calculation_exponentiation(db_session, test_user):
     assert data["type"] == "exponentiation"
     assert data["result"] == 8
 
-def test_create_calculation_modulus(db_session, test_user):
+def test_create_calculation_modulus(api_client, db_session, auth_headers):
     """Test creating modulus calculation"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
     calc_data = {
         "type": "modulus",
         "inputs": [10, 3]
     }
     
-    response = client.post(
+    response = api_client.post(
         "/calculations",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json=calc_data
     )
     
@@ -260,39 +192,89 @@ def test_create_calculation_modulus(db_session, test_user):
     assert data["type"] == "modulus"
     assert data["result"] == 1
 
-def test_create_calculation_modulus_by_zero(db_session, test_user):
+def test_create_calculation_modulus_by_zero(api_client, db_session, auth_headers):
     """Test creating modulus calculation with zero fails"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
     calc_data = {
         "type": "modulus",
         "inputs": [10, 0]
     }
     
-    response = client.post(
+    response = api_client.post(
         "/calculations",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json=calc_data
     )
     
     assert response.status_code == 400
     assert "zero" in response.json()["detail"].lower()
 
-def test_create_calculation_exponentiation_multiple(db_session, test_user):
+def test_create_calculation_exponentiation_multiple(api_client, db_session, auth_headers):
     """Test creating exponentiation with multiple inputs"""
-    token = User.create_access_token({"sub": str(test_user.id)})
-    
     calc_data = {
         "type": "exponentiation",
         "inputs": [2, 3, 2]
     }
     
-    response = client.post(
+    response = api_client.post(
         "/calculations",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers,
         json=calc_data
     )
     
     assert response.status_code == 201
     data = response.json()
     assert data["result"] == 64  # (2^3)^2 = 64
+
+def test_create_calculation_minimum(api_client, db_session, auth_headers):
+    """Test creating minimum calculation"""
+    calc_data = {
+        "type": "minimum",
+        "inputs": [5, 2, 8, 1]
+    }
+    
+    response = api_client.post(
+        "/calculations",
+        headers=auth_headers,
+        json=calc_data
+    )
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert data["type"] == "minimum"
+    assert data["result"] == 1
+
+def test_create_calculation_maximum(api_client, db_session, auth_headers):
+    """Test creating maximum calculation"""
+    calc_data = {
+        "type": "maximum",
+        "inputs": [5, 2, 8, 1]
+    }
+    
+    response = api_client.post(
+        "/calculations",
+        headers=auth_headers,
+        json=calc_data
+    )
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert data["type"] == "maximum"
+    assert data["result"] == 8
+
+def test_create_calculation_average(api_client, db_session, auth_headers):
+    """Test creating average calculation"""
+    calc_data = {
+        "type": "average",
+        "inputs": [10, 20, 30]
+    }
+    
+    response = api_client.post(
+        "/calculations",
+        headers=auth_headers,
+        json=calc_data
+    )
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert data["type"] == "average"
+    assert data["result"] == 20
@@ -199,6 +199,17 @@ def test_transaction_rollback(db_session):
     final_count = db_session.query(User).count()
     assert final_count == initial_count, "The new user should not have been committed"
 
+def test_commit_only_releases_savepoint(db_session, connection):
+    """
+    db_session joins the test's outer transaction through a SAVEPOINT, so
+    commit() releases the savepoint and the real transaction stays open -
+    everything the test committed is still rolled back afterwards.
+    """
+    db_session.add(User(**create_fake_user()))
+    db_session.commit()
+    
+    assert connection.in_transaction(), "commit() should not end the outer transaction"
+
 # ======================================================================================
 # Update Tests
 # ======================================================================================
@@ -4,7 +4,8 @@ import pytest
 from uuid import UUID
 import pydantic_core
 from sqlalchemy.exc import IntegrityError
-from app.models.user import User
+from jose import JWTError
+from app.models.user import MAX_TOKEN_PAYLOAD_LENGTH, User
 
 def test_password_hashing(db_session, fake_user_data):
     """Test password hashing and verification functionality"""
@@ -147,6 +148,25 @@ def test_invalid_token():
     result = User.verify_token(invalid_token)
     assert result is None
 
+def test_oversized_token_rejected_before_decoding(monkeypatch):
+    """Test that tokens with an oversized payload segment never reach jwt.decode"""
+    decoded = []
+
+    def spy_decode(token, *args, **kwargs):
+        decoded.append(token)
+        raise JWTError("spy")
+
+    monkeypatch.setattr("app.models.user.jwt.decode", spy_decode)
+
+    oversized_token = "header." + "a" * (MAX_TOKEN_PAYLOAD_LENGTH + 1) + ".signature"
+    assert User.verify_token(oversized_token) is None
+    assert User.verify_token("only.two") is None
+    assert decoded == []
+
+    at_limit_token = "header." + "a" * MAX_TOKEN_PAYLOAD_LENGTH + ".signature"
+    assert User.verify_token(at_limit_token) is None
+    assert decoded == [at_limit_token]
+
 def test_token_creation_and_verification(db_session, fake_user_data):
     """Test token creation and verification"""
     fake_user_data['password'] = "TestPass123"
@@ -7,274 +7,66 @@ from app.models.calculation import (
     Minimum,
     Maximum,
     Average,
+    cached_on_inputs,
 )
 
-# Helper function to create a dummy user_id for testing.
-def dummy_user_id():
-    return uuid.uuid4()
-
-def test_exponentiation_get_result():
-    """
-    Test that Exponentiation.get_result returns the correct power.
-    """
-    inputs = [2, 3]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    result = exponentiation.get_result()
-    assert result == 8, f"Expected 8, got {result}"
-
-def test_exponentiation_multiple_values():
-    """
-    Test exponentiation with multiple values (left to right).
-    """
-    inputs = [2, 3, 2]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    # (2 ** 3) ** 2 = 8 ** 2 = 64
-    result = exponentiation.get_result()
-    assert result == 64, f"Expected 64, got {result}"
-
-def test_exponentiation_with_decimal():
-    """
-    Test exponentiation with decimal values.
-    """
-    inputs = [5, 2]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    result = exponentiation.get_result()
-    assert result == 25, f"Expected 25, got {result}"
-
-def test_exponentiation_with_zero():
-    """
-    Test exponentiation with zero as exponent.
-    """
-    inputs = [10, 0]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    result = exponentiation.get_result()
-    assert result == 1, f"Expected 1, got {result}"
-
-def test_exponentiation_with_negative():
-    """
-    Test exponentiation with negative exponent.
-    """
-    inputs = [2, -2]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    result = exponentiation.get_result()
-    assert result == 0.25, f"Expected 0.25, got {result}"
-
-def test_exponentiation_invalid_inputs_not_list():
-    """
-    Test that providing non-list inputs raises ValueError.
-    """
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs="not-a-list")
-    with pytest.raises(ValueError, match="Inputs must be a list of numbers."):
-        exponentiation.get_result()
-
-def test_exponentiation_invalid_inputs_single_value():
-    """
-    Test that providing single value raises ValueError.
-    """
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=[5])
-    with pytest.raises(ValueError, match="Inputs must be a list with at least two numbers."):
-        exponentiation.get_result()
-
-def test_modulus_get_result():
-    """
-    Test that Modulus.get_result returns the correct remainder.
-    """
-    inputs = [10, 3]
-    modulus = Modulus(user_id=dummy_user_id(), inputs=inputs)
-    result = modulus.get_result()
-    assert result == 1, f"Expected 1, got {result}"
-
-def test_modulus_multiple_values():
-    """
-    Test modulus with multiple values (left to right).
-    """
-    inputs = [100, 30, 7]
-    modulus = Modulus(user_id=dummy_user_id(), inputs=inputs)
-    # (100 % 30) % 7 = 10 % 7 = 3
-    result = modulus.get_result()
-    assert result == 3, f"Expected 3, got {result}"
-
-def test_modulus_exact_division():
-    """
-    Test modulus when numbers divide evenly.
-    """
-    inputs = [20, 5]
-    modulus = Modulus(user_id=dummy_user_id(), inputs=inputs)
-    result = modulus.get_result()
-    assert result == 0, f"Expected 0, got {result}"
-
-def test_modulus_with_decimal():
-    """
-    Test modulus with decimal values.
-    """
-    inputs = [17.5, 5]
-    modulus = Modulus(user_id=dummy_user_id(), inputs=inputs)
-    result = modulus.get_result()
-    assert result == 2.5, f"Expected 2.5, got {result}"
-
-def test_modulus_by_zero():
-    """
-    Test that Modulus.get_result raises ValueError when performing modulus by zero.
-    """
-    inputs = [50, 0]
-    modulus = Modulus(user_id=dummy_user_id(), inputs=inputs)
-    with pytest.raises(ValueError, match="Cannot perform modulus by zero."):
-        modulus.get_result()
-
-def test_modulus_by_zero_in_sequence():
-    """
-    Test that Modulus raises ValueError when zero appears in middle of sequence.
-    """
-    inputs = [100, 30, 0]
-    modulus = Modulus(user_id=dummy_user_id(), inputs=inputs)
-    with pytest.raises(ValueError, match="Cannot perform modulus by zero."):
-        modulus.get_result()
-
-def test_modulus_invalid_inputs_not_list():
-    """
-    Test that providing non-list inputs raises ValueError.
-    """
-    modulus = Modulus(user_id=dummy_user_id(), inputs="not-a-list")
-    with pytest.raises(ValueError, match="Inputs must be a list of numbers."):
-        modulus.get_result()
-
-def test_modulus_invalid_inputs_single_value():
-    """
-    Test that providing single value raises ValueError.
-    """
-    modulus = Modulus(user_id=dummy_user_id(), inputs=[10])
-    with pytest.raises(ValueError, match="Inputs must be a list with at least two numbers."):
-        modulus.get_result()
-
-def test_calculation_factory_exponentiation():
-    """
-    Test the Calculation.create factory method for exponentiation.
-    """
-    inputs = [3, 4]
-    calc = Calculation.create(
-        calculation_type='exponentiation',
-        user_id=dummy_user_id(),
-        inputs=inputs,
-    )
-    assert isinstance(calc, Exponentiation), "Factory did not return an Exponentiation instance."
-    assert calc.get_result() == 81, "Incorrect exponentiation result."
-
-def test_calculation_factory_modulus():
-    """
-    Test the Calculation.create factory method for modulus.
-    """
-    inputs = [17, 5]
-    calc = Calculation.create(
-        calculation_type='modulus',
-        user_id=dummy_user_id(),
-        inputs=inputs,
-    )
-    assert isinstance(calc, Modulus), "Factory did not return a Modulus instance."
-    assert calc.get_result() == 2, "Incorrect modulus result."
-
-def test_large_exponentiation():
-    """
-    Test exponentiation with larger numbers.
-    """
-    inputs = [10, 3]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    result = exponentiation.get_result()
-    assert result == 1000, f"Expected 1000, got {result}"
-
-def test_fractional_exponentiation():
-    """
-    Test exponentiation with fractional exponent (square root).
-    """
-    inputs = [16, 0.5]
-    exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=inputs)
-    result = exponentiation.get_result()
-    assert result == 4, f"Expected 4, got {result}"
+# Any valid UUID will do; the calculations never look at the user_id.
+DUMMY_USER_ID = uuid.UUID(int=0)
+
+@pytest.mark.parametrize("cls, inputs, expected", [
+    (Exponentiation, [2, 3], 8),
+    (Exponentiation, [2, 3, 2], 64),  # (2 ** 3) ** 2, left to right
+    (Exponentiation, [5, 2], 25),
+    (Exponentiation, [10, 0], 1),
+    (Exponentiation, [2, -2], 0.25),
+    (Exponentiation, [10, 3], 1000),
+    (Exponentiation, [16, 0.5], 4),  # square root
+    (Modulus, [10, 3], 1),
+    (Modulus, [100, 30, 7], 3),  # (100 % 30) % 7, left to right
+    (Modulus, [20, 5], 0),
+    (Modulus, [17.5, 5], 2.5),
+])
+def test_exponentiation_and_modulus(cls, inputs, expected):
+    """
+    Test that Exponentiation and Modulus fold their inputs left to right.
+    """
+    result = cls(user_id=DUMMY_USER_ID, inputs=inputs).get_result()
+    assert result == expected, f"Expected {expected}, got {result}"
+
+@pytest.mark.parametrize("cls, inputs, exc_match", [
+    (Exponentiation, "not-a-list", "Inputs must be a list of numbers."),
+    (Exponentiation, [5], "Inputs must be a list with at least two numbers."),
+    (Modulus, "not-a-list", "Inputs must be a list of numbers."),
+    (Modulus, [10], "Inputs must be a list with at least two numbers."),
+    (Modulus, [50, 0], "Cannot perform modulus by zero."),
+    (Modulus, [100, 30, 0], "Cannot perform modulus by zero."),
+])
+def test_exponentiation_and_modulus_invalid(cls, inputs, exc_match):
+    """
+    Test that invalid inputs and modulus by zero raise ValueError.
+    """
+    calc = cls(user_id=DUMMY_USER_ID, inputs=inputs)
+    with pytest.raises(ValueError, match=exc_match):
+        calc.get_result()
 
 # ============================================================================
-# Minimum Tests
+# Minimum / Maximum Tests
 # ============================================================================
-def test_minimum_basic():
-    """Test basic minimum finding"""
-    inputs = [5, 2, 9, 1]
-    minimum = Minimum(user_id=dummy_user_id(), inputs=inputs)
-    result = minimum.get_result()
-    assert result == 1
-
-def test_minimum_negative_numbers():
-    """Test minimum with negative numbers"""
-    inputs = [10, -5, 3, -2]
-    minimum = Minimum(user_id=dummy_user_id(), inputs=inputs)
-    result = minimum.get_result()
-    assert result == -5
-
-def test_minimum_decimals():
-    """Test minimum with decimal numbers"""
-    inputs = [7.5, 3.2, 9.1, 2.8]
-    minimum = Minimum(user_id=dummy_user_id(), inputs=inputs)
-    result = minimum.get_result()
-    assert result == 2.8
-
-def test_minimum_two_values():
-    """Test minimum with just two values"""
-    inputs = [10, 5]
-    minimum = Minimum(user_id=dummy_user_id(), inputs=inputs)
-    result = minimum.get_result()
-    assert result == 5
-
-def test_minimum_invalid_inputs():
-    """Test minimum with invalid inputs"""
-    minimum = Minimum(user_id=dummy_user_id(), inputs="not-a-list")
-    with pytest.raises(ValueError, match="Inputs must be a list"):
-        minimum.get_result()
-
-def test_minimum_insufficient_inputs():
-    """Test minimum with insufficient inputs"""
-    minimum = Minimum(user_id=dummy_user_id(), inputs=[10])
-    with pytest.raises(ValueError, match="at least two numbers"):
-        minimum.get_result()
-
-# ============================================================================
-# Maximum Tests
-# ============================================================================
-def test_maximum_basic():
-    """Test basic maximum finding"""
-    inputs = [5, 2, 9, 1]
-    maximum = Maximum(user_id=dummy_user_id(), inputs=inputs)
-    result = maximum.get_result()
-    assert result == 9
-
-def test_maximum_negative_numbers():
-    """Test maximum with negative numbers"""
-    inputs = [-10, -5, -3, -20]
-    maximum = Maximum(user_id=dummy_user_id(), inputs=inputs)
-    result = maximum.get_result()
-    assert result == -3
-
-def test_maximum_decimals():
-    """Test maximum with decimal numbers"""
-    inputs = [7.5, 3.2, 9.1, 2.8]
-    maximum = Maximum(user_id=dummy_user_id(), inputs=inputs)
-    result = maximum.get_result()
-    assert result == 9.1
-
-def test_maximum_two_values():
-    """Test maximum with just two values"""
-    inputs = [10, 5]
-    maximum = Maximum(user_id=dummy_user_id(), inputs=inputs)
-    result = maximum.get_result()
-    assert result == 10
-
-def test_maximum_invalid_inputs():
-    """Test maximum with invalid inputs"""
-    maximum = Maximum(user_id=dummy_user_id(), inputs="not-a-list")
-    with pytest.raises(ValueError, match="Inputs must be a list"):
-        maximum.get_result()
-
-def test_maximum_insufficient_inputs():
-    """Test maximum with insufficient inputs"""
-    maximum = Maximum(user_id=dummy_user_id(), inputs=[10])
-    with pytest.raises(ValueError, match="at least two numbers"):
-        maximum.get_result()
+# Each case's inputs with the expected result per class
+EXTREMUM_CASES = {
+    "basic": ([5, 2, 9, 1], {Minimum: 1, Maximum: 9}),
+    "mixed_signs": ([10, -5, 3, -2], {Minimum: -5, Maximum: 10}),
+    "negatives": ([-10, -5, -3, -20], {Minimum: -20, Maximum: -3}),
+    "decimals": ([7.5, 3.2, 9.1, 2.8], {Minimum: 2.8, Maximum: 9.1}),
+    "two_values": ([10, 5], {Minimum: 5, Maximum: 10}),
+}
+
+@pytest.mark.parametrize("cls", [Minimum, Maximum])
+@pytest.mark.parametrize("case", list(EXTREMUM_CASES))
+def test_extremum(cls, case):
+    """Test Minimum and Maximum pick the right value"""
+    inputs, expected = EXTREMUM_CASES[case]
+    assert cls(user_id=DUMMY_USER_ID, inputs=inputs).get_result() == expected[cls]
 
 # ============================================================================
 # Average Tests
@@ -282,67 +74,102 @@ def test_maximum_insufficient_inputs():
 def test_average_basic():
     """Test basic average calculation"""
     inputs = [10, 20, 30]
-    average = Average(user_id=dummy_user_id(), inputs=inputs)
+    average = Average(user_id=DUMMY_USER_ID, inputs=inputs)
     result = average.get_result()
     assert result == 20
 
 def test_average_two_values():
     """Test average with two values"""
     inputs = [5, 15]
-    average = Average(user_id=dummy_user_id(), inputs=inputs)
+    average = Average(user_id=DUMMY_USER_ID, inputs=inputs)
     result = average.get_result()
     assert result == 10
 
 def test_average_negative_numbers():
     """Test average with negative numbers"""
     inputs = [-10, 10, 0]
-    average = Average(user_id=dummy_user_id(), inputs=inputs)
+    average = Average(user_id=DUMMY_USER_ID, inputs=inputs)
     result = average.get_result()
     assert result == 0
 
 def test_average_decimals():
     """Test average with decimal numbers"""
     inputs = [2.5, 3.5, 4.0]
-    average = Average(user_id=dummy_user_id(), inputs=inputs)
+    average = Average(user_id=DUMMY_USER_ID, inputs=inputs)
     result = average.get_result()
-    assert abs(result - 3.333333) < 0.001
+    assert result == pytest.approx(10 / 3, abs=1e-3)
 
 def test_average_many_values():
     """Test average with many values"""
     inputs = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-    average = Average(user_id=dummy_user_id(), inputs=inputs)
+    average = Average(user_id=DUMMY_USER_ID, inputs=inputs)
     result = average.get_result()
     assert result == 5.5
 
-def test_average_invalid_inputs():
-    """Test average with invalid inputs"""
-    average = Average(user_id=dummy_user_id(), inputs="not-a-list")
-    with pytest.raises(ValueError, match="Inputs must be a list"):
-        average.get_result()
-
-def test_average_insufficient_inputs():
-    """Test average with insufficient inputs"""
-    average = Average(user_id=dummy_user_id(), inputs=[10])
-    with pytest.raises(ValueError, match="at least two numbers"):
-        average.get_result()
-
 # ============================================================================
-# Factory Pattern Tests for New Types
+# Invalid Input Tests for New Types
 # ============================================================================
-def test_factory_minimum():
-    """Test factory creates Minimum instance"""
-    calc = Calculation.create('minimum', dummy_user_id(), [5, 2, 9, 1])
-    assert isinstance(calc, Minimum)
-    assert calc.get_result() == 1
-
-def test_factory_maximum():
-    """Test factory creates Maximum instance"""
-    calc = Calculation.create('maximum', dummy_user_id(), [5, 2, 9, 1])
-    assert isinstance(calc, Maximum)
-    assert calc.get_result() == 9
+@pytest.mark.parametrize("cls", [Minimum, Maximum, Average])
+@pytest.mark.parametrize("inputs, exc_match", [
+    ("not-a-list", "Inputs must be a list"),
+    ([10], "at least two numbers"),
+])
+def test_new_types_invalid_inputs(cls, inputs, exc_match):
+    """Test non-list and single-value inputs are rejected"""
+    calc = cls(user_id=DUMMY_USER_ID, inputs=inputs)
+    with pytest.raises(ValueError, match=exc_match):
+        calc.get_result()
 
-def test_factory_average():
-    """Test factory creates Average instance"""
-    calc = Calculation.create('average', dummy_user_id(), [10, 20, 30])
-    assert isinstance(calc, Average)
+# ============================================================================
+# Factory Pattern Tests
+# ============================================================================
+# Inputs per type; the factory builds each instance once for the module.
+FACTORY_INPUTS = {
+    "exponentiation": [3, 4],
+    "modulus": [17, 5],
+    "minimum": [5, 2, 9, 1],
+    "maximum": [5, 2, 9, 1],
+    "average": [10, 20, 30],
+}
+
+@pytest.fixture(scope="module")
+def factory_calcs():
+    """Calculation.create results keyed by type, shared across the factory tests"""
+    return {
+        calc_type: Calculation.create(calc_type, DUMMY_USER_ID, inputs)
+        for calc_type, inputs in FACTORY_INPUTS.items()
+    }
+
+@pytest.mark.parametrize("calc_type, cls, expected", [
+    ("exponentiation", Exponentiation, 81),
+    ("modulus", Modulus, 2),
+    ("minimum", Minimum, 1),
+    ("maximum", Maximum, 9),
+    ("average", Average, 20),
+])
+def test_factory(factory_calcs, calc_type, cls, expected):
+    """Test factory creates the right instance for each type"""
+    calc = factory_calcs[calc_type]
+    assert isinstance(calc, cls)
+    assert calc.get_result() == expected
+
+def test_get_result_cached_until_inputs_reassigned(monkeypatch):
+    """Test get_result is computed once per inputs list"""
+    compute = Average.get_result.__wrapped__
+    calls = []
+
+    def counting_compute(self):
+        calls.append(list(self.inputs))
+        return compute(self)
+
+    monkeypatch.setattr(Average, "get_result", cached_on_inputs(counting_compute))
+
+    calc = Average(user_id=DUMMY_USER_ID, inputs=[10, 20, 30])
     assert calc.get_result() == 20
+    assert calc.get_result() == 20
+    assert calls == [[10, 20, 30]]
+
+    calc.inputs = [1, 3]
+    assert calc.get_result() == 2
+    assert calc.get_result() == 2
+    assert calls == [[10, 20, 30], [1, 3]]
@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+from app.schemas.user import PasswordUpdate
+
+
+def test_password_update_valid():
+    """Test PasswordUpdate with matching, changed passwords."""
+    data = PasswordUpdate(
+        current_password="TestPass123",
+        new_password="NewPass456",
+        confirm_new_password="NewPass456",
+    )
+    assert data.new_password == "NewPass456"
+
+
+def test_password_update_mismatch():
+    """Test PasswordUpdate with mismatched new passwords."""
+    with pytest.raises(ValidationError, match="do not match"):
+        PasswordUpdate(
+            current_password="TestPass123",
+            new_password="NewPass456",
+            confirm_new_password="DifferentPass789",
+        )
+
+
+def test_password_update_same_as_old():
+    """Test PasswordUpdate with the new password equal to the current one."""
+    with pytest.raises(ValidationError, match="must be different"):
+        PasswordUpdate(
+            current_password="TestPass123",
+            new_password="TestPass123",
+            confirm_new_password="TestPass123",
+        )
+
+
+def test_password_update_too_short():
+    """Test PasswordUpdate with a new password below the minimum length."""
+    with pytest.raises(ValidationError):
+        PasswordUpdate(
+            current_password="TestPass123",
+            new_password="short",
+            confirm_new_password="short",
+        )
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from app.auth import redis as blacklist
+
+
+class FakeRedis:
+    """Minimal async stand-in for the Redis client used by the blacklist."""
+
+    def __init__(self):
+        self.store = {}
+        self.exists_calls = 0
+        self.executes = 0
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def exists(self, key):
+        self.exists_calls += 1
+        return int(key in self.store)
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.store):
+            if key.startswith(prefix):
+                yield key
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffers commands and applies them on execute, like a real pipeline."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value))
+
+    def unlink(self, *keys):
+        self.commands.extend(("unlink", key, None) for key in keys)
+
+    async def execute(self):
+        self.client.executes += 1
+        for command, key, value in self.commands:
+            if command == "set":
+                self.client.store[key] = value
+            else:
+                self.client.store.pop(key, None)
+        self.commands = []
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+
+    async def _get_redis():
+        return client
+
+    monkeypatch.setattr(blacklist, "get_redis", _get_redis)
+    blacklist._negative_cache.clear()
+    blacklist._positive_cache.clear()
+    yield client
+    blacklist._negative_cache.clear()
+    blacklist._positive_cache.clear()
+
+
+def test_is_blacklisted_caches_negative_lookups(fake_redis):
+    """Repeated checks for a clean JTI only hit Redis once"""
+    assert asyncio.run(blacklist.is_blacklisted("jti-1")) is False
+    assert asyncio.run(blacklist.is_blacklisted("jti-1")) is False
+    assert fake_redis.exists_calls == 1
+
+
+def test_add_to_blacklist_invalidates_negative_cache(fake_redis):
+    """A logout is visible in-process without another Redis lookup"""
+    assert asyncio.run(blacklist.is_blacklisted("jti-2")) is False
+    asyncio.run(blacklist.add_to_blacklist("jti-2", 60))
+
+    assert asyncio.run(blacklist.is_blacklisted("jti-2")) is True
+    assert fake_redis.exists_calls == 1
+    assert fake_redis.store == {"blacklist:jti-2": "1"}
+
+
+def test_add_many_uses_one_round_trip(fake_redis):
+    """Bulk revocation is a single pipeline execute"""
+    asyncio.run(blacklist.add_many_to_blacklist([("a", 60), ("b", 60), ("c", 60)]))
+    assert fake_redis.executes == 1
+    assert asyncio.run(blacklist.is_blacklisted("b")) is True
+
+
+def test_remove_prefix_executes_once_per_batch(fake_redis):
+    """Eviction sends each full batch as it fills, then the remainder"""
+    asyncio.run(blacklist.add_many_to_blacklist([(str(n), 60) for n in range(5)]))
+    fake_redis.executes = 0
+
+    asyncio.run(blacklist.remove_prefix("blacklist:", batch_size=2))
+    assert fake_redis.executes == 3  # 2 + 2 + 1 keys
+    assert fake_redis.store == {}
+    assert asyncio.run(blacklist.is_blacklisted("1")) is False
+
+
+def test_remove_prefix_without_matches_sends_nothing(fake_redis):
+    """An empty scan doesn't execute an empty pipeline"""
+    asyncio.run(blacklist.remove_prefix("blacklist:"))
+    assert fake_redis.executes == 0
+
+
+def test_get_redis_creates_single_client_under_concurrency(monkeypatch):
+    """Concurrent first calls share one client instead of racing"""
+    created = []
+
+    class FakeModule:
+        @staticmethod
+        def from_url(url, **kwargs):
+            created.append(url)
+            return FakeRedis()
+
+    monkeypatch.setattr(blacklist, "aioredis", FakeModule)
+    monkeypatch.setattr(blacklist, "_redis", None)
+    monkeypatch.setattr(blacklist, "_init_lock", None)
+
+    async def _burst():
+        return await asyncio.gather(*(blacklist.get_redis() for _ in range(10)))
+
+    clients = asyncio.run(_burst())
+    assert len(created) == 1
+    assert all(client is clients[0] for client in clients)